@@ -0,0 +1,60 @@
+import pytest
+import torch
+from transformers import DistilBertConfig, DistilBertForSequenceClassification, DistilBertTokenizerFast
+
+from SentimentAnalysis import BERTFineTuner, EarlyExitDistilBert
+
+
+@pytest.fixture
+def model():
+    torch.manual_seed(0)
+    config = DistilBertConfig(vocab_size=32, dim=16, n_layers=3, n_heads=2, hidden_dim=32,
+                              max_position_embeddings=16, num_labels=2)
+    return EarlyExitDistilBert(config).eval()
+
+
+@pytest.fixture
+def padded_batch():
+    input_ids = torch.tensor([[2, 5, 6, 7, 3], [2, 8, 3, 0, 0]])
+    attention_mask = torch.tensor([[1, 1, 1, 1, 1], [1, 1, 1, 0, 0]])
+    return input_ids, attention_mask
+
+
+def test_full_depth_matches_forward_on_padded_batch(model, padded_batch):
+    input_ids, attention_mask = padded_batch
+    with torch.inference_mode():
+        # A softmax probability never exceeds 1, so every sample runs all layers
+        logits = model.early_exit_logits(input_ids, attention_mask, threshold=1.0)
+        expected = model(input_ids=input_ids, attention_mask=attention_mask).logits
+    torch.testing.assert_close(logits, expected)
+
+
+def test_padding_does_not_change_logits(model, padded_batch):
+    input_ids, attention_mask = padded_batch
+    with torch.inference_mode():
+        padded = model.early_exit_logits(input_ids, attention_mask, threshold=1.0)
+        unpadded = model.early_exit_logits(input_ids[1:, :3], attention_mask[1:, :3], threshold=1.0)
+    torch.testing.assert_close(padded[1:], unpadded)
+
+
+def test_zero_threshold_exits_after_first_layer(model, padded_batch):
+    input_ids, attention_mask = padded_batch
+    with torch.inference_mode():
+        logits = model.early_exit_logits(input_ids, attention_mask, threshold=0.0)
+        first_layer = model.distilbert.transformer.layer[0]
+        embeddings = model.distilbert.embeddings(input_ids)
+        expected = [model.exit_heads[0](first_layer(embeddings[i:i + 1, :length])[:, 0])
+                    for i, length in enumerate(attention_mask.sum(dim=1).tolist())]
+    torch.testing.assert_close(logits, torch.cat(expected))
+
+
+def test_missing_exit_heads_rejected(tmp_path):
+    vocab = tmp_path / "vocab.txt"
+    vocab.write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", "good", "bad"]))
+    DistilBertTokenizerFast(vocab_file=str(vocab)).save_pretrained(tmp_path)
+    config = DistilBertConfig(vocab_size=8, dim=16, n_layers=2, n_heads=2, hidden_dim=32,
+                              max_position_embeddings=16, num_labels=2)
+    DistilBertForSequenceClassification(config).save_pretrained(tmp_path)
+
+    with pytest.raises(ValueError, match="early-exit heads"):
+        BERTFineTuner(model_path=str(tmp_path), exit_threshold=0.9)
@@ -0,0 +1,9 @@
+from SentimentAnalysis import BERTFineTuner
+
+
+def test_training_arguments_build(tmp_path):
+    args = BERTFineTuner.training_arguments("cpu", output_dir=str(tmp_path))
+    assert args.eval_strategy == "epoch"
+    assert args.save_strategy == "epoch"
+    assert args.gradient_checkpointing
+    assert not args.bf16 and not args.fp16
@@ -0,0 +1,24 @@
+import os
+
+import torch
+from transformers import DistilBertConfig, DistilBertTokenizerFast
+
+from SentimentAnalysis import BERTFineTuner, EarlyExitDistilBert
+
+
+def test_cpu_inference_exports_quantized_onnx(tmp_path, monkeypatch):
+    monkeypatch.setattr(torch.cuda, "is_available", lambda: False)
+    vocab = tmp_path / "vocab.txt"
+    vocab.write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", "good", "bad", "product"]))
+    DistilBertTokenizerFast(vocab_file=str(vocab)).save_pretrained(tmp_path)
+    config = DistilBertConfig(vocab_size=8, dim=16, n_layers=2, n_heads=2, hidden_dim=32,
+                              max_position_embeddings=32, num_labels=2)
+    EarlyExitDistilBert(config).save_pretrained(tmp_path)
+
+    fine_tuner = BERTFineTuner(model_path=str(tmp_path))
+    predictions = fine_tuner.classify_reviews(["good product", "bad", "good good bad product"])
+
+    assert os.path.exists(tmp_path / "model.int8.onnx")
+    assert not os.path.exists(tmp_path / "model.onnx")
+    assert all(prediction in ("positive", "negative") for prediction in predictions)
+    assert len(predictions) == 3
@@ -0,0 +1,44 @@
+import asyncio
+
+import lxml.html
+
+from SentimentAnalysis import ReviewScraper
+
+PAGE = """
+<html><body>
+  <span data-hook="rating-out-of-text">4.5 out of 5</span>
+  <a class="a-link-normal review-title" href="#"><span>5.0 out of 5 stars</span>
+Great sound</a>
+  <span data-hook="review-body"> Loved it. </span>
+</body></html>
+"""
+
+
+def make_scraper(monkeypatch):
+    scraper = ReviewScraper("Some-Product", "B000000000", "api-key")
+
+    async def fake_page_tree(client, url):
+        return lxml.html.fromstring(PAGE)
+
+    monkeypatch.setattr(scraper, "get_page_tree", fake_page_tree)
+    return scraper
+
+
+def test_scrape_reviews_concurrently(monkeypatch):
+    titles, reviews, star_rating = make_scraper(monkeypatch).scrape_reviews_concurrently(total_pages=2)
+    assert titles == {1: "Great sound", 11: "Great sound"}
+    assert reviews == ["Loved it.", "Loved it."]
+    assert star_rating == "4.5 out of 5"
+
+
+def test_scrape_reviews_concurrently_inside_running_loop(monkeypatch):
+    scraper = make_scraper(monkeypatch)
+
+    # Simulating a notebook cell, where an event loop is already running
+    async def notebook_cell():
+        return scraper.scrape_reviews_concurrently(total_pages=1)
+
+    titles, reviews, star_rating = asyncio.run(notebook_cell())
+    assert titles == {1: "Great sound"}
+    assert reviews == ["Loved it."]
+    assert star_rating == "4.5 out of 5"
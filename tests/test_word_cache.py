@@ -0,0 +1,51 @@
+import os
+import pickle
+import tempfile
+
+import nltk
+import pytest
+
+import SentimentAnalysis
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(SentimentAnalysis, "_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(nltk.data, "find", lambda resource: f"/nltk_data/{resource}")
+    return tmp_path
+
+
+def test_cache_hit_skips_loader(cache_dir):
+    words = SentimentAnalysis._load_cached_frozenset("words.pkl", "corpora/test", lambda: ["good", "bad"])
+    assert words == frozenset({"good", "bad"})
+
+    def fail():
+        raise AssertionError("loader called on a cache hit")
+
+    assert SentimentAnalysis._load_cached_frozenset("words.pkl", "corpora/test", fail) == words
+
+
+def test_truncated_cache_is_rebuilt(cache_dir):
+    (cache_dir / "words.pkl").write_bytes(b"\x80\x05trunc")
+    words = SentimentAnalysis._load_cached_frozenset("words.pkl", "corpora/test", lambda: ["good"])
+    assert words == frozenset({"good"})
+
+
+def test_unwritable_cache_dir_still_returns_words(cache_dir, monkeypatch):
+    def read_only(*args, **kwargs):
+        raise PermissionError("read-only")
+
+    monkeypatch.setattr(tempfile, "NamedTemporaryFile", read_only)
+    words = SentimentAnalysis._load_cached_frozenset("words.pkl", "corpora/test", lambda: ["good"])
+    assert words == frozenset({"good"})
+    assert os.listdir(cache_dir) == []
+
+
+def test_failed_dump_removes_temporary_file(cache_dir, monkeypatch):
+    def broken_dump(*args, **kwargs):
+        raise pickle.PicklingError("broken")
+
+    monkeypatch.setattr(pickle, "dump", broken_dump)
+    with pytest.raises(pickle.PicklingError):
+        SentimentAnalysis._load_cached_frozenset("words.pkl", "corpora/test", lambda: ["good"])
+    assert os.listdir(cache_dir) == []